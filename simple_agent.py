@@ -10,13 +10,94 @@ technical knowledge, and ethical considerations across multiple domains.
 import sys
 import re
 import json
+import operator
 import random
-import datetime
 import time
-from typing import Dict, List, Any, Optional, Union
+from collections import Counter
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import ahocorasick  # type: ignore  # optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Pre-compiled patterns used on every query
+_MATH_PATTERNS = [re.compile(p) for p in (
+    r'(?<!\d)\d+\s*[\+\-\*/\^]\s*\d+',  # Basic arithmetic
+    # Mathematical functions with word boundaries
+    r'\b(?:sqrt|log|sin|cos|tan|exp|factorial)\b',
+    r'calculate|compute|solve|equation|formula',  # Mathematical keywords
+    r'(?<!\d)\d+\s*(plus|minus|times|divided by)\s*\d+',  # Written arithmetic
+    r'percentage|percent|%|ratio|proportion'  # Statistical terms
+)]
+# Cheap superset of _MATH_PATTERNS: every pattern needs a digit, '%' or one
+# of these words, so queries with none of them skip the precise checks
+_MATH_CHARS = frozenset("0123456789%")
+_MATH_KEYWORDS_RE = re.compile(
+    r'sqrt|log|sin|cos|tan|exp|factorial|calculate|compute|solve|equation|formula|percent|ratio|proportion')
+_ARITH_RE = re.compile(r'(?<!\d)(\d+(?:\.\d+)?)\s*([\+\-\*/\^])\s*(\d+(?:\.\d+)?)')
+_PERCENT_RE = re.compile(r'(?<!\d)(\d+(?:\.\d+)?)\s*(?:percent|%)\s*of\s*(\d+(?:\.\d+)?)', re.IGNORECASE)
+
+# (epoch second, formatted local time) of the last general response
+_timestamp_cache: Tuple[int, str] = (0, "")
+
+
+def _current_timestamp() -> str:
+    """Local time to the second; strftime runs at most once per second"""
+    global _timestamp_cache
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+    return _timestamp_cache[1]
+
+
+# Arithmetic operators shared by calculation and verification
+_OPS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '^': operator.pow
+}
+
+# Step-by-step explanation per operator; only the matching one is formatted
+_EXPLANATIONS = {
+    '+': "Adding {num1} and {num2}",
+    '-': "Subtracting {num2} from {num1}",
+    '*': "Multiplying {num1} by {num2}",
+    '/': "Dividing {num1} by {num2}",
+    '^': "Raising {num1} to the power of {num2}"
+}
+
+
+class _SubstringMatcher:
+    """Dependency-free stand-in for ahocorasick.Automaton (add_word/iter only)
+
+    Uses C-level ``in`` checks per keyword; on short queries this measured
+    faster than both a pure-Python trie and fused alternation regexes.
+    """
+
+    __slots__ = ("_words",)
+
+    def __init__(self) -> None:
+        self._words: List[Tuple[str, Any]] = []
+
+    def add_word(self, word: str, value: Any) -> None:
+        self._words.append((word, value))
+
+    def make_automaton(self) -> None:
+        pass
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """Yield (end_index, value) for the first occurrence of each keyword"""
+        for word, value in self._words:
+            index = text.find(word)
+            if index >= 0:
+                yield index + len(word) - 1, value
+
 
 class QueryType(Enum):
     MATHEMATICAL = "mathematical"
@@ -34,7 +115,28 @@ class QueryType(Enum):
     GENERAL = "general"
 
 
-@dataclass
+# Responses for these types vary per call (random element, timestamp)
+_UNCACHEABLE_TYPES = frozenset({QueryType.CREATIVE, QueryType.GENERAL})
+_CACHE_SIZE = 1024
+
+_DOMAIN_TO_TYPE = {
+    "security": QueryType.SECURITY,
+    "architecture": QueryType.ARCHITECTURAL,
+    "optimization": QueryType.OPTIMIZATION,
+    "compliance": QueryType.COMPLIANCE,
+    "innovation": QueryType.INNOVATION,
+    "business": QueryType.STRATEGIC
+}
+
+
+def _cache_put(cache: Dict[str, Any], key: str, value: Any) -> None:
+    """Store into a bounded per-agent cache, evicting the oldest entry"""
+    if len(cache) >= _CACHE_SIZE:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+@dataclass(slots=True)
 class AnalysisResult:
     query_type: QueryType
     confidence: float
@@ -42,12 +144,281 @@ class AnalysisResult:
     complexity_level: str
 
 
+# Static response templates: headers are formatted per call, bodies are shared
+
+_SECURITY_HEADER = "🔒 Advanced Security Analysis (Complexity: {lvl})\n\n"
+_SECURITY_BODY = (
+    "Security Framework Assessment:\n"
+    "• Authentication: Implement multi-factor authentication with biometric verification\n"
+    "• Authorization: Role-based access control (RBAC) with principle of least privilege\n"
+    "• Data Protection: AES-256 encryption at rest, TLS 1.3 in transit\n"
+    "• Input Validation: Comprehensive sanitization against injection attacks\n"
+    "• Monitoring: Real-time threat detection with SIEM integration\n\n"
+
+    "Vulnerability Assessment:\n"
+    "• Code Review: Static analysis with tools like SonarQube, Checkmarx\n"
+    "• Penetration Testing: Regular red team exercises and bug bounty programs\n"
+    "• Dependency Scanning: Automated vulnerability detection in third-party libraries\n"
+    "• Infrastructure Security: Container scanning, network segmentation\n\n"
+
+    "Incident Response Plan:\n"
+    "• Detection: Automated alerting systems with threat intelligence feeds\n"
+    "• Containment: Isolation protocols and forensic data preservation\n"
+    "• Recovery: Backup restoration procedures and business continuity\n"
+    "• Lessons Learned: Post-incident analysis and security posture improvement\n\n"
+
+    "Compliance Considerations:\n"
+    "• GDPR: Data privacy by design, consent management\n"
+    "• SOX: Financial data integrity and audit trails\n"
+    "• HIPAA: Healthcare data protection and access logging\n"
+    "• PCI DSS: Payment card data security standards"
+)
+
+_ARCHITECTURAL_HEADER = "🏗️ Enterprise Architecture Design (Complexity: {lvl})\n\n"
+_ARCHITECTURAL_BODY = (
+    "Scalable System Architecture:\n"
+    "• Microservices: Domain-driven design with bounded contexts\n"
+    "• API Gateway: Rate limiting, authentication, request routing\n"
+    "• Load Balancing: Layer 7 routing with health checks and failover\n"
+    "• Service Mesh: Istio for inter-service communication and observability\n"
+    "• Event-Driven: Apache Kafka for asynchronous message processing\n\n"
+
+    "Data Architecture:\n"
+    "• Polyglot Persistence: SQL for transactions, NoSQL for scale, Graph for relationships\n"
+    "• Data Lake: Raw data storage with Apache Spark for processing\n"
+    "• Real-time Analytics: Stream processing with Apache Flink\n"
+    "• Data Governance: Schema registry, data lineage, quality monitoring\n\n"
+
+    "Cloud-Native Design:\n"
+    "• Containerization: Docker with Kubernetes orchestration\n"
+    "• Infrastructure as Code: Terraform for resource management\n"
+    "• CI/CD: GitOps with ArgoCD for automated deployments\n"
+    "• Observability: Prometheus metrics, Jaeger tracing, ELK logging\n\n"
+
+    "Performance & Reliability:\n"
+    "• Caching: Multi-level with Redis and CDN\n"
+    "• Circuit Breakers: Hystrix patterns for fault tolerance\n"
+    "• Auto-scaling: Horizontal pod autoscaling based on metrics\n"
+    "• Disaster Recovery: Multi-region deployment with automated failover"
+)
+
+_OPTIMIZATION_HEADER = "⚡ Performance Optimization Strategy (Complexity: {lvl})\n\n"
+_OPTIMIZATION_BODY = (
+    "Algorithm Optimization:\n"
+    "• Time Complexity: Analyze Big O notation and optimize critical paths\n"
+    "• Space Complexity: Memory profiling and optimization techniques\n"
+    "• Data Structures: Choose optimal structures for specific use cases\n"
+    "• Parallel Processing: Multi-threading and asynchronous programming\n\n"
+
+    "System-Level Optimization:\n"
+    "• Database: Query optimization, indexing strategies, connection pooling\n"
+    "• Caching: Multi-tier caching with cache invalidation strategies\n"
+    "• Network: Compression, CDN utilization, keep-alive connections\n"
+    "• Resource Management: Memory pooling, object reuse patterns\n\n"
+
+    "Infrastructure Optimization:\n"
+    "• Auto-scaling: Predictive scaling based on historical patterns\n"
+    "• Load Distribution: Geographic load balancing and edge computing\n"
+    "• Resource Allocation: Right-sizing instances and cost optimization\n"
+    "• Monitoring: APM tools for continuous performance insights\n\n"
+
+    "Code-Level Improvements:\n"
+    "• Profiling: CPU and memory profiling to identify bottlenecks\n"
+    "• JIT Compilation: Just-in-time optimization for dynamic languages\n"
+    "• Lazy Loading: On-demand resource loading strategies\n"
+    "• Batch Processing: Bulk operations for improved throughput"
+)
+
+_COMPLIANCE_HEADER = "⚖️ Compliance & Governance Framework (Complexity: {lvl})\n\n"
+_COMPLIANCE_BODY = (
+    "GDPR Compliance:\n"
+    "• Data Minimization: Collect only necessary personal data\n"
+    "• Consent Management: Granular consent with easy withdrawal\n"
+    "• Right to be Forgotten: Automated data deletion capabilities\n"
+    "• Data Portability: Export user data in structured formats\n"
+    "• Privacy by Design: Built-in privacy protection mechanisms\n\n"
+
+    "AI Ethics & Bias Mitigation:\n"
+    "• Algorithmic Transparency: Explainable AI implementations\n"
+    "• Bias Detection: Regular audits for discriminatory outcomes\n"
+    "• Fairness Metrics: Demographic parity and equalized odds\n"
+    "• Human Oversight: Human-in-the-loop for critical decisions\n\n"
+
+    "Audit & Governance:\n"
+    "• Audit Trails: Immutable logs of all system interactions\n"
+    "• Risk Assessment: Regular compliance risk evaluations\n"
+    "• Policy Enforcement: Automated compliance rule checking\n"
+    "• Training Programs: Regular staff education on compliance\n\n"
+
+    "Regulatory Frameworks:\n"
+    "• SOX: Financial reporting controls and data integrity\n"
+    "• HIPAA: Healthcare data protection and access controls\n"
+    "• PCI DSS: Payment card industry security standards\n"
+    "• ISO 27001: Information security management systems"
+)
+
+_INNOVATION_HEADER = "🚀 Innovation & Emerging Technologies (Complexity: {lvl})\n\n"
+_INNOVATION_BODY = (
+    "AI/ML Innovation:\n"
+    "• Foundation Models: Large language models with fine-tuning capabilities\n"
+    "• Multi-modal AI: Vision, language, and audio processing integration\n"
+    "• Federated Learning: Privacy-preserving distributed machine learning\n"
+    "• AutoML: Automated machine learning pipeline generation\n"
+    "• Explainable AI: Interpretable models for critical applications\n\n"
+
+    "Quantum Computing Readiness:\n"
+    "• Quantum Algorithms: Shor's and Grover's algorithm implementations\n"
+    "• Quantum Cryptography: Post-quantum cryptographic migration\n"
+    "• Hybrid Systems: Classical-quantum computing integration\n"
+    "• Error Correction: Quantum error correction protocols\n\n"
+
+    "Edge & IoT Innovation:\n"
+    "• Edge AI: On-device machine learning inference\n"
+    "• 5G Integration: Ultra-low latency edge computing\n"
+    "• Digital Twins: Real-time virtual representations\n"
+    "• Autonomous Systems: Self-managing infrastructure\n\n"
+
+    "Future Technologies:\n"
+    "• Neuromorphic Computing: Brain-inspired computing architectures\n"
+    "• Blockchain Evolution: DeFi, NFTs, and Web3 applications\n"
+    "• Extended Reality: AR/VR/MR immersive experiences\n"
+    "• Biotechnology: DNA data storage and biocomputing"
+)
+
+_STRATEGIC_HEADER = "💼 Strategic Analysis & Planning (Complexity: {lvl})\n\n"
+_STRATEGIC_BODY = (
+    "Market Analysis:\n"
+    "• Competitive Landscape: Porter's Five Forces analysis\n"
+    "• Market Positioning: Blue Ocean vs. Red Ocean strategies\n"
+    "• Customer Segmentation: Behavioral and demographic analysis\n"
+    "• Value Proposition: Jobs-to-be-Done framework\n"
+    "• Business Model Innovation: Platform and ecosystem strategies\n\n"
+
+    "Technology Strategy:\n"
+    "• Digital Transformation: Legacy modernization roadmap\n"
+    "• Technology Stack: Build vs. buy vs. partner decisions\n"
+    "• Innovation Portfolio: Core, adjacent, and transformational bets\n"
+    "• Technical Debt Management: Systematic debt reduction planning\n\n"
+
+    "Risk Management:\n"
+    "• Technology Risks: Obsolescence and vendor lock-in mitigation\n"
+    "• Operational Risks: Business continuity and disaster recovery\n"
+    "• Regulatory Risks: Compliance and legal risk assessment\n"
+    "• Market Risks: Scenario planning and sensitivity analysis\n\n"
+
+    "Implementation Strategy:\n"
+    "• Roadmap Planning: Phased delivery with value milestones\n"
+    "• Change Management: Organizational change and adoption\n"
+    "• Success Metrics: KPIs and OKRs for tracking progress\n"
+    "• Resource Allocation: Budget and talent optimization"
+)
+
+_REASONING_HEADER = "🧠 Advanced Reasoning Analysis (Complexity: {lvl})\n\n"
+_REASONING_BODY = (
+    "Problem Decomposition:\n"
+    "• Root Cause Analysis: Five Whys and fishbone diagram techniques\n"
+    "• Systems Thinking: Identifying feedback loops and leverage points\n"
+    "• Constraint Theory: Bottleneck identification and optimization\n"
+    "• Risk-Benefit Analysis: Quantitative decision-making frameworks\n\n"
+
+    "Logical Framework:\n"
+    "• Deductive Reasoning: Premise-based logical conclusions\n"
+    "• Inductive Reasoning: Pattern recognition and generalization\n"
+    "• Abductive Reasoning: Best explanation inference\n"
+    "• Analogical Reasoning: Cross-domain knowledge transfer\n\n"
+
+    "Decision Making:\n"
+    "• Multi-criteria Analysis: Weighted decision matrices\n"
+    "• Scenario Planning: Best, worst, and most likely outcomes\n"
+    "• Game Theory: Strategic interaction analysis\n"
+    "• Cognitive Bias Mitigation: Structured decision processes\n\n"
+
+    "Solution Design:\n"
+    "• Design Thinking: Human-centered problem solving\n"
+    "• First Principles: Fundamental assumption challenging\n"
+    "• TRIZ Methodology: Systematic innovation principles\n"
+    "• Agile Problem Solving: Iterative solution development"
+)
+
+_CREATIVE_ELEMENTS = (
+    "Design Thinking methodology with user-centered innovation",
+    "Cross-pollination of ideas from different industries",
+    "Biomimicry principles for nature-inspired solutions",
+    "Lateral thinking techniques for breakthrough insights",
+    "Human-centered design with accessibility as core principle"
+)
+_N_CREATIVE = len(_CREATIVE_ELEMENTS)
+_CREATIVE_HEADER = (
+    "🎨 Creative Innovation Framework (Complexity: {lvl})\n\n"
+    "Primary Approach: {element}\n\n"
+)
+_CREATIVE_BODY = (
+    "Innovation Methodology:\n"
+    "• Divergent Thinking: Generate multiple solution alternatives\n"
+    "• Convergent Analysis: Evaluate and refine promising concepts\n"
+    "• Rapid Prototyping: Quick iteration with user feedback\n"
+    "• Cross-functional Collaboration: Diverse perspective integration\n\n"
+
+    "Creative Techniques:\n"
+    "• SCAMPER Method: Substitute, Combine, Adapt, Modify, Put to other uses, Eliminate, Reverse\n"
+    "• Mind Mapping: Visual association and idea exploration\n"
+    "• Brainstorming 2.0: Structured ideation with building blocks\n"
+    "• Role Playing: Alternative perspective generation\n\n"
+
+    "Implementation Strategy:\n"
+    "• MVP Development: Minimum viable product validation\n"
+    "• A/B Testing: Data-driven feature optimization\n"
+    "• User Journey Mapping: End-to-end experience design\n"
+    "• Feedback Loops: Continuous improvement mechanisms\n\n"
+
+    "Innovation Metrics:\n"
+    "• Time to Market: Development velocity optimization\n"
+    "• User Adoption: Engagement and retention metrics\n"
+    "• Innovation Pipeline: Idea generation and conversion rates\n"
+    "• ROI Measurement: Value creation and cost-benefit analysis"
+)
+
+_GENERAL_HEADER = (
+    "🤖 Advanced AI Analysis (Complexity: {lvl})\n\n"
+    "Query Understanding:\n"
+    "• Analysis Confidence: {confidence:.1%}\n"
+    "• Reasoning: {reasoning}\n"
+    "• Processing Time: {timestamp}\n\n"
+)
+_GENERAL_BODY = (
+    "Multi-Dimensional Response:\n"
+    "• Context Analysis: Understanding implicit requirements and constraints\n"
+    "• Solution Architecture: Comprehensive approach with implementation details\n"
+    "• Risk Assessment: Potential challenges and mitigation strategies\n"
+    "• Success Metrics: Measurable outcomes and validation criteria\n\n"
+
+    "Advanced Capabilities:\n"
+    "• Cross-domain Knowledge: Integration of multiple expertise areas\n"
+    "• Adaptive Learning: Continuous improvement based on feedback\n"
+    "• Ethical Reasoning: Consideration of moral and social implications\n"
+    "• Future-proofing: Anticipation of evolving requirements and technologies\n\n"
+
+    "Next Steps Recommendation:\n"
+    "• Define specific requirements and success criteria\n"
+    "• Conduct stakeholder analysis and alignment\n"
+    "• Develop prototype or proof of concept\n"
+    "• Establish feedback loops and iteration cycles"
+)
+
+
 class AdvancedAIAgent:
     """
     Advanced AI Agent with sophisticated reasoning capabilities
     """
 
-    def __init__(self):
+    __slots__ = (
+        "knowledge_domains", "query_patterns", "complexity_indicators",
+        "_complexity_res", "_compiled_query_patterns", "_query_pattern_unions",
+        "_kw2dom", "_domain_inv_size", "_ac", "_dispatch", "_response_cache",
+        "_analysis_cache",
+    )
+
+    def __init__(self) -> None:
         self.knowledge_domains = {
             "security": ["vulnerability", "vulnerabilities", "attack", "exploit", "penetration", "authentication",
                          "authorization", "encryption", "cipher", "cryptography", "threat", "security", "secure",
@@ -105,24 +476,89 @@ class AdvancedAIAgent:
             "advanced": ["architect", "optimize", "integrate", "comprehensive", "sophisticated"],
             "expert": ["quantum", "distributed", "concurrent", "enterprise", "multi-domain"]
         }
+        # Highest level first; one alternation per level replaces the
+        # per-indicator substring checks
+        self._complexity_res = [
+            (level, re.compile("|".join(map(re.escape, self.complexity_indicators[level]))))
+            for level in ["expert", "advanced", "intermediate", "basic"]
+        ]
+
+        self._compiled_query_patterns = {
+            domain: [re.compile(p) for p in patterns]
+            for domain, patterns in self.query_patterns.items()
+        }
+        # One alternation per domain screens out non-matching domains in a
+        # single search; individual patterns only run when it hits
+        self._query_pattern_unions = {
+            domain: re.compile("|".join(f"(?:{p})" for p in patterns))
+            for domain, patterns in self.query_patterns.items()
+        }
+
+        # Reverse index keyword -> domains; a keyword may belong to several
+        # domains (e.g. "framework")
+        kw2dom: Dict[str, List[str]] = {}
+        for domain, keywords in self.knowledge_domains.items():
+            for keyword in keywords:
+                kw2dom.setdefault(keyword, []).append(domain)
+        self._kw2dom = {kw: tuple(domains) for kw, domains in kw2dom.items()}
+        self._domain_inv_size = {d: 1.0 / len(kws) for d, kws in self.knowledge_domains.items()}
+
+        # Single keyword automaton over all domains
+        self._ac = ahocorasick.Automaton() if ahocorasick else _SubstringMatcher()
+        for keyword, domains in self._kw2dom.items():
+            self._ac.add_word(keyword, (keyword, domains))
+        self._ac.make_automaton()
+
+        # Query type -> response generator, built once per agent
+        self._dispatch = {
+            QueryType.MATHEMATICAL: self.generate_mathematical_response,
+            QueryType.SECURITY: self.generate_security_response,
+            QueryType.ARCHITECTURAL: self.generate_architectural_response,
+            QueryType.OPTIMIZATION: self.generate_optimization_response,
+            QueryType.COMPLIANCE: self.generate_compliance_response,
+            QueryType.INNOVATION: self.generate_innovation_response,
+            QueryType.STRATEGIC: self.generate_strategic_response,
+            QueryType.REASONING: self.generate_reasoning_response,
+            QueryType.CREATIVE: self.generate_creative_response,
+            # Fallback to architectural
+            QueryType.TECHNICAL: self.generate_architectural_response,
+            QueryType.ETHICAL: self.generate_compliance_response,  # Fallback to compliance
+            # Fallback to architectural
+            QueryType.INTEGRATION: self.generate_architectural_response,
+            QueryType.GENERAL: self.generate_general_response
+        }
 
-    def analyze_query(self, query: str) -> AnalysisResult:
+        # Deterministic responses keyed by raw query, oldest evicted first
+        self._response_cache: Dict[str, str] = {}
+        # Analyses keyed by raw query (complexity uses its raw length); these
+        # are memoised even for types whose responses are not cacheable
+        self._analysis_cache: Dict[str, AnalysisResult] = {}
+
+    def analyze_query(self, query: str, query_lower: Optional[str] = None) -> AnalysisResult:
         """Advanced query analysis with deep understanding"""
-        query_lower = query.lower()
+        if query_lower is None:
+            query_lower = query.lower()
 
         # Enhanced domain analysis with keyword and pattern matching
         domain_scores = {}
 
-        # Keyword-based scoring
-        for domain, keywords in self.knowledge_domains.items():
-            score = sum(1 for keyword in keywords if keyword in query_lower)
-            if score > 0:
-                domain_scores[domain] = score / len(keywords)
+        # Keyword-based scoring: one automaton pass, each keyword counted once
+        counts: Counter[str] = Counter()
+        seen = set()
+        for _, (keyword, domains) in self._ac.iter(query_lower):
+            if keyword not in seen:
+                seen.add(keyword)
+                counts.update(domains)
+        for domain, inv_size in self._domain_inv_size.items():
+            if counts[domain]:
+                domain_scores[domain] = counts[domain] * inv_size
 
         # Pattern-based scoring (additional boost)
-        for domain, patterns in self.query_patterns.items():
+        for domain, patterns in self._compiled_query_patterns.items():
+            if not self._query_pattern_unions[domain].search(query_lower):
+                continue
             pattern_matches = sum(
-                1 for pattern in patterns if re.search(pattern, query_lower))
+                1 for pattern in patterns if pattern.search(query_lower))
             if pattern_matches > 0:
                 # Add pattern bonus to existing score or create new score
                 pattern_bonus = pattern_matches * 0.3  # Each pattern match adds 30%
@@ -131,15 +567,18 @@ class AdvancedAIAgent:
 
         # If we have strong domain matches, use them
         if domain_scores:
-            primary_domain = max(domain_scores, key=domain_scores.get)
-            max_score = domain_scores[primary_domain]
+            # Strict '>' keeps the first domain on ties, like max()
+            primary_domain, max_score = "", -1.0
+            for domain, score in domain_scores.items():
+                if score > max_score:
+                    primary_domain, max_score = domain, score
 
             # Only check for mathematical if no strong domain match
-            if max_score < 0.2 and self._is_mathematical(query):
+            if max_score < 0.2 and self._is_mathematical(query_lower):
                 return AnalysisResult(
                     QueryType.MATHEMATICAL, 0.95,
                     "Detected mathematical expression or calculation request",
-                    self._assess_complexity(query)
+                    self._assess_complexity(query_lower, len(query))
                 )
             else:
                 query_type = self._map_domain_to_type(primary_domain)
@@ -147,60 +586,50 @@ class AdvancedAIAgent:
                 return AnalysisResult(
                     query_type, confidence,
                     f"Domain analysis identified: {primary_domain} (score: {max_score:.2f})",
-                    self._assess_complexity(query)
+                    self._assess_complexity(query_lower, len(query))
                 )
 
         # Mathematical detection as fallback for pure math queries
-        if self._is_mathematical(query):
+        if self._is_mathematical(query_lower):
             return AnalysisResult(
                 QueryType.MATHEMATICAL, 0.95,
                 "Detected mathematical expression or calculation request",
-                self._assess_complexity(query)
+                self._assess_complexity(query_lower, len(query))
             )
 
         # General fallback
         return AnalysisResult(
             QueryType.GENERAL, 0.7,
             "Domain analysis identified: general",
-            self._assess_complexity(query)
+            self._assess_complexity(query_lower, len(query))
         )
 
-    def _is_mathematical(self, query: str) -> bool:
+    def _is_mathematical(self, query_lower: str) -> bool:
         """Enhanced mathematical detection"""
-        math_patterns = [
-            r'\d+\s*[\+\-\*/\^]\s*\d+',  # Basic arithmetic
-            # Mathematical functions with word boundaries
-            r'\b(?:sqrt|log|sin|cos|tan|exp|factorial)\b',
-            r'calculate|compute|solve|equation|formula',  # Mathematical keywords
-            r'\d+\s*(plus|minus|times|divided by)\s*\d+',  # Written arithmetic
-            r'percentage|percent|%|ratio|proportion'  # Statistical terms
-        ]
-        return any(re.search(pattern, query.lower()) for pattern in math_patterns)
+        # \d also matches non-ASCII digits, so only prefilter ASCII queries
+        if (query_lower.isascii() and _MATH_CHARS.isdisjoint(query_lower)
+                and not _MATH_KEYWORDS_RE.search(query_lower)):
+            return False
+        return any(pattern.search(query_lower) for pattern in _MATH_PATTERNS)
 
     def _map_domain_to_type(self, domain: str) -> QueryType:
         """Map knowledge domains to query types"""
-        mapping = {
-            "security": QueryType.SECURITY,
-            "architecture": QueryType.ARCHITECTURAL,
-            "optimization": QueryType.OPTIMIZATION,
-            "compliance": QueryType.COMPLIANCE,
-            "innovation": QueryType.INNOVATION,
-            "business": QueryType.STRATEGIC
-        }
-        return mapping.get(domain, QueryType.TECHNICAL)
+        return _DOMAIN_TO_TYPE.get(domain, QueryType.TECHNICAL)
 
-    def _assess_complexity(self, query: str) -> str:
-        """Assess query complexity level"""
-        query_lower = query.lower()
+    def _assess_complexity(self, query_lower: str, query_length: int) -> str:
+        """Assess query complexity level
 
-        for level in ["expert", "advanced", "intermediate", "basic"]:
-            if any(indicator in query_lower for indicator in self.complexity_indicators[level]):
+        ``query_length`` is the raw query length; ``str.lower()`` can grow
+        some characters (e.g. "İ"), so it is not taken from ``query_lower``.
+        """
+        for level, indicators_re in self._complexity_res:
+            if indicators_re.search(query_lower):
                 return level
 
         # Fallback based on query length and structure
-        if len(query) > 200:
+        if query_length > 200:
             return "advanced"
-        elif len(query) > 100:
+        elif query_length > 100:
             return "intermediate"
         else:
             return "basic"
@@ -209,33 +638,29 @@ class AdvancedAIAgent:
         """Advanced mathematical processing with step-by-step solutions"""
 
         # Enhanced arithmetic parsing
-        arithmetic_match = re.search(
-            r'(\d+(?:\.\d+)?)\s*([\+\-\*/\^])\s*(\d+(?:\.\d+)?)', query)
+        arithmetic_match = _ARITH_RE.search(query)
         if arithmetic_match:
-            num1, operator, num2 = arithmetic_match.groups()
+            num1, op, num2 = arithmetic_match.groups()
             num1, num2 = float(num1), float(num2)
 
-            operations = {
-                '+': lambda x, y: x + y,
-                '-': lambda x, y: x - y,
-                '*': lambda x, y: x * y,
-                '/': lambda x, y: x / y if y != 0 else "undefined (division by zero)",
-                '^': lambda x, y: x ** y
-            }
-
-            if operator in operations and operator != '/' or (operator == '/' and num2 != 0):
-                result = operations[operator](num1, num2)
-                return (f"Mathematical Analysis:\n"
-                        f"Operation: {num1} {operator} {num2}\n"
-                        f"Step-by-step: {self._explain_calculation(num1, operator, num2)}\n"
-                        f"Result: {result}\n"
-                        f"Verification: {self._verify_calculation(num1, operator, num2, result)}")
-            else:
-                return f"Mathematical Error: {operations[operator](num1, num2)}"
+            op_func = _OPS.get(op)
+            if op_func is None:
+                return "Mathematical Error: unknown operator"
+            if op == '/' and num2 == 0:
+                return "Mathematical Error: undefined (division by zero)"
+
+            try:
+                result = op_func(num1, num2)
+            except OverflowError:
+                return "Mathematical Error: result out of range"
+            return (f"Mathematical Analysis:\n"
+                    f"Operation: {num1} {op} {num2}\n"
+                    f"Step-by-step: {self._explain_calculation(num1, op, num2)}\n"
+                    f"Result: {result}\n"
+                    f"Verification: {self._verify_calculation(num1, op, num2, result)}")
 
         # Percentage calculations
-        percent_match = re.search(
-            r'(\d+(?:\.\d+)?)\s*(?:percent|%)\s*of\s*(\d+(?:\.\d+)?)', query.lower())
+        percent_match = _PERCENT_RE.search(query)
         if percent_match:
             percent, total = float(percent_match.group(
                 1)), float(percent_match.group(2))
@@ -247,360 +672,116 @@ class AdvancedAIAgent:
                 "calculus derivatives, matrix operations, and optimization problems. "
                 "Please provide specific numerical expressions for precise calculations.")
 
-    def _explain_calculation(self, num1: float, operator: str, num2: float) -> str:
+    def _explain_calculation(self, num1: float, op: str, num2: float) -> str:
         """Provide step-by-step explanation"""
-        explanations = {
-            '+': f"Adding {num1} and {num2}",
-            '-': f"Subtracting {num2} from {num1}",
-            '*': f"Multiplying {num1} by {num2}",
-            '/': f"Dividing {num1} by {num2}",
-            '^': f"Raising {num1} to the power of {num2}"
-        }
-        return explanations.get(operator, "Performing calculation")
+        template = _EXPLANATIONS.get(op)
+        if template is None:
+            return "Performing calculation"
+        return template.format(num1=num1, num2=num2)
 
-    def _verify_calculation(self, num1: float, operator: str, num2: float, result: Union[float, str]) -> str:
+    def _verify_calculation(self, num1: float, op: str, num2: float, result: float) -> str:
         """Verify calculation accuracy"""
-        if isinstance(result, str):
-            return "Cannot verify due to mathematical error"
-
-        # Simple verification logic
-        if operator == '+' and abs((num1 + num2) - result) < 0.001:
-            return "✓ Calculation verified"
-        elif operator == '-' and abs((num1 - num2) - result) < 0.001:
-            return "✓ Calculation verified"
-        elif operator == '*' and abs((num1 * num2) - result) < 0.001:
-            return "✓ Calculation verified"
-        elif operator == '/' and num2 != 0 and abs((num1 / num2) - result) < 0.001:
-            return "✓ Calculation verified"
-        elif operator == '^' and abs((num1 ** num2) - result) < 0.001:
-            return "✓ Calculation verified"
-        else:
-            return "⚠ Verification inconclusive"
+        op_func = _OPS.get(op)
+        if op_func is not None and not (op == '/' and num2 == 0):
+            if abs(op_func(num1, num2) - result) < 0.001:
+                return "✓ Calculation verified"
+        return "⚠ Verification inconclusive"
 
     def generate_security_response(self, query: str, analysis: AnalysisResult) -> str:
         """Advanced security analysis and recommendations"""
 
-        return (
-            f"🔒 Advanced Security Analysis (Complexity: {analysis.complexity_level})\n\n"
-            "Security Framework Assessment:\n"
-            "• Authentication: Implement multi-factor authentication with biometric verification\n"
-            "• Authorization: Role-based access control (RBAC) with principle of least privilege\n"
-            "• Data Protection: AES-256 encryption at rest, TLS 1.3 in transit\n"
-            "• Input Validation: Comprehensive sanitization against injection attacks\n"
-            "• Monitoring: Real-time threat detection with SIEM integration\n\n"
-
-            "Vulnerability Assessment:\n"
-            "• Code Review: Static analysis with tools like SonarQube, Checkmarx\n"
-            "• Penetration Testing: Regular red team exercises and bug bounty programs\n"
-            "• Dependency Scanning: Automated vulnerability detection in third-party libraries\n"
-            "• Infrastructure Security: Container scanning, network segmentation\n\n"
-
-            "Incident Response Plan:\n"
-            "• Detection: Automated alerting systems with threat intelligence feeds\n"
-            "• Containment: Isolation protocols and forensic data preservation\n"
-            "• Recovery: Backup restoration procedures and business continuity\n"
-            "• Lessons Learned: Post-incident analysis and security posture improvement\n\n"
-
-            "Compliance Considerations:\n"
-            "• GDPR: Data privacy by design, consent management\n"
-            "• SOX: Financial data integrity and audit trails\n"
-            "• HIPAA: Healthcare data protection and access logging\n"
-            "• PCI DSS: Payment card data security standards"
-        )
+        return _SECURITY_HEADER.format(lvl=analysis.complexity_level) + _SECURITY_BODY
 
     def generate_architectural_response(self, query: str, analysis: AnalysisResult) -> str:
         """Sophisticated system architecture design"""
 
-        return (
-            f"🏗️ Enterprise Architecture Design (Complexity: {analysis.complexity_level})\n\n"
-            "Scalable System Architecture:\n"
-            "• Microservices: Domain-driven design with bounded contexts\n"
-            "• API Gateway: Rate limiting, authentication, request routing\n"
-            "• Load Balancing: Layer 7 routing with health checks and failover\n"
-            "• Service Mesh: Istio for inter-service communication and observability\n"
-            "• Event-Driven: Apache Kafka for asynchronous message processing\n\n"
-
-            "Data Architecture:\n"
-            "• Polyglot Persistence: SQL for transactions, NoSQL for scale, Graph for relationships\n"
-            "• Data Lake: Raw data storage with Apache Spark for processing\n"
-            "• Real-time Analytics: Stream processing with Apache Flink\n"
-            "• Data Governance: Schema registry, data lineage, quality monitoring\n\n"
-
-            "Cloud-Native Design:\n"
-            "• Containerization: Docker with Kubernetes orchestration\n"
-            "• Infrastructure as Code: Terraform for resource management\n"
-            "• CI/CD: GitOps with ArgoCD for automated deployments\n"
-            "• Observability: Prometheus metrics, Jaeger tracing, ELK logging\n\n"
-
-            "Performance & Reliability:\n"
-            "• Caching: Multi-level with Redis and CDN\n"
-            "• Circuit Breakers: Hystrix patterns for fault tolerance\n"
-            "• Auto-scaling: Horizontal pod autoscaling based on metrics\n"
-            "• Disaster Recovery: Multi-region deployment with automated failover"
-        )
+        return _ARCHITECTURAL_HEADER.format(lvl=analysis.complexity_level) + _ARCHITECTURAL_BODY
 
     def generate_optimization_response(self, query: str, analysis: AnalysisResult) -> str:
         """Advanced performance optimization strategies"""
 
-        return (
-            f"⚡ Performance Optimization Strategy (Complexity: {analysis.complexity_level})\n\n"
-            "Algorithm Optimization:\n"
-            "• Time Complexity: Analyze Big O notation and optimize critical paths\n"
-            "• Space Complexity: Memory profiling and optimization techniques\n"
-            "• Data Structures: Choose optimal structures for specific use cases\n"
-            "• Parallel Processing: Multi-threading and asynchronous programming\n\n"
-
-            "System-Level Optimization:\n"
-            "• Database: Query optimization, indexing strategies, connection pooling\n"
-            "• Caching: Multi-tier caching with cache invalidation strategies\n"
-            "• Network: Compression, CDN utilization, keep-alive connections\n"
-            "• Resource Management: Memory pooling, object reuse patterns\n\n"
-
-            "Infrastructure Optimization:\n"
-            "• Auto-scaling: Predictive scaling based on historical patterns\n"
-            "• Load Distribution: Geographic load balancing and edge computing\n"
-            "• Resource Allocation: Right-sizing instances and cost optimization\n"
-            "• Monitoring: APM tools for continuous performance insights\n\n"
-
-            "Code-Level Improvements:\n"
-            "• Profiling: CPU and memory profiling to identify bottlenecks\n"
-            "• JIT Compilation: Just-in-time optimization for dynamic languages\n"
-            "• Lazy Loading: On-demand resource loading strategies\n"
-            "• Batch Processing: Bulk operations for improved throughput"
-        )
+        return _OPTIMIZATION_HEADER.format(lvl=analysis.complexity_level) + _OPTIMIZATION_BODY
 
     def generate_compliance_response(self, query: str, analysis: AnalysisResult) -> str:
         """Comprehensive compliance and governance framework"""
 
-        return (
-            f"⚖️ Compliance & Governance Framework (Complexity: {analysis.complexity_level})\n\n"
-            "GDPR Compliance:\n"
-            "• Data Minimization: Collect only necessary personal data\n"
-            "• Consent Management: Granular consent with easy withdrawal\n"
-            "• Right to be Forgotten: Automated data deletion capabilities\n"
-            "• Data Portability: Export user data in structured formats\n"
-            "• Privacy by Design: Built-in privacy protection mechanisms\n\n"
-
-            "AI Ethics & Bias Mitigation:\n"
-            "• Algorithmic Transparency: Explainable AI implementations\n"
-            "• Bias Detection: Regular audits for discriminatory outcomes\n"
-            "• Fairness Metrics: Demographic parity and equalized odds\n"
-            "• Human Oversight: Human-in-the-loop for critical decisions\n\n"
-
-            "Audit & Governance:\n"
-            "• Audit Trails: Immutable logs of all system interactions\n"
-            "• Risk Assessment: Regular compliance risk evaluations\n"
-            "• Policy Enforcement: Automated compliance rule checking\n"
-            "• Training Programs: Regular staff education on compliance\n\n"
-
-            "Regulatory Frameworks:\n"
-            "• SOX: Financial reporting controls and data integrity\n"
-            "• HIPAA: Healthcare data protection and access controls\n"
-            "• PCI DSS: Payment card industry security standards\n"
-            "• ISO 27001: Information security management systems"
-        )
+        return _COMPLIANCE_HEADER.format(lvl=analysis.complexity_level) + _COMPLIANCE_BODY
 
     def generate_innovation_response(self, query: str, analysis: AnalysisResult) -> str:
         """Advanced innovation and emerging technology insights"""
 
-        return (
-            f"🚀 Innovation & Emerging Technologies (Complexity: {analysis.complexity_level})\n\n"
-            "AI/ML Innovation:\n"
-            "• Foundation Models: Large language models with fine-tuning capabilities\n"
-            "• Multi-modal AI: Vision, language, and audio processing integration\n"
-            "• Federated Learning: Privacy-preserving distributed machine learning\n"
-            "• AutoML: Automated machine learning pipeline generation\n"
-            "• Explainable AI: Interpretable models for critical applications\n\n"
-
-            "Quantum Computing Readiness:\n"
-            "• Quantum Algorithms: Shor's and Grover's algorithm implementations\n"
-            "• Quantum Cryptography: Post-quantum cryptographic migration\n"
-            "• Hybrid Systems: Classical-quantum computing integration\n"
-            "• Error Correction: Quantum error correction protocols\n\n"
-
-            "Edge & IoT Innovation:\n"
-            "• Edge AI: On-device machine learning inference\n"
-            "• 5G Integration: Ultra-low latency edge computing\n"
-            "• Digital Twins: Real-time virtual representations\n"
-            "• Autonomous Systems: Self-managing infrastructure\n\n"
-
-            "Future Technologies:\n"
-            "• Neuromorphic Computing: Brain-inspired computing architectures\n"
-            "• Blockchain Evolution: DeFi, NFTs, and Web3 applications\n"
-            "• Extended Reality: AR/VR/MR immersive experiences\n"
-            "• Biotechnology: DNA data storage and biocomputing"
-        )
+        return _INNOVATION_HEADER.format(lvl=analysis.complexity_level) + _INNOVATION_BODY
 
     def generate_strategic_response(self, query: str, analysis: AnalysisResult) -> str:
         """Strategic business and technical analysis"""
 
-        return (
-            f"💼 Strategic Analysis & Planning (Complexity: {analysis.complexity_level})\n\n"
-            "Market Analysis:\n"
-            "• Competitive Landscape: Porter's Five Forces analysis\n"
-            "• Market Positioning: Blue Ocean vs. Red Ocean strategies\n"
-            "• Customer Segmentation: Behavioral and demographic analysis\n"
-            "• Value Proposition: Jobs-to-be-Done framework\n"
-            "• Business Model Innovation: Platform and ecosystem strategies\n\n"
-
-            "Technology Strategy:\n"
-            "• Digital Transformation: Legacy modernization roadmap\n"
-            "• Technology Stack: Build vs. buy vs. partner decisions\n"
-            "• Innovation Portfolio: Core, adjacent, and transformational bets\n"
-            "• Technical Debt Management: Systematic debt reduction planning\n\n"
-
-            "Risk Management:\n"
-            "• Technology Risks: Obsolescence and vendor lock-in mitigation\n"
-            "• Operational Risks: Business continuity and disaster recovery\n"
-            "• Regulatory Risks: Compliance and legal risk assessment\n"
-            "• Market Risks: Scenario planning and sensitivity analysis\n\n"
-
-            "Implementation Strategy:\n"
-            "• Roadmap Planning: Phased delivery with value milestones\n"
-            "• Change Management: Organizational change and adoption\n"
-            "• Success Metrics: KPIs and OKRs for tracking progress\n"
-            "• Resource Allocation: Budget and talent optimization"
-        )
+        return _STRATEGIC_HEADER.format(lvl=analysis.complexity_level) + _STRATEGIC_BODY
 
     def generate_reasoning_response(self, query: str, analysis: AnalysisResult) -> str:
         """Advanced logical reasoning and problem-solving"""
 
-        return (
-            f"🧠 Advanced Reasoning Analysis (Complexity: {analysis.complexity_level})\n\n"
-            "Problem Decomposition:\n"
-            "• Root Cause Analysis: Five Whys and fishbone diagram techniques\n"
-            "• Systems Thinking: Identifying feedback loops and leverage points\n"
-            "• Constraint Theory: Bottleneck identification and optimization\n"
-            "• Risk-Benefit Analysis: Quantitative decision-making frameworks\n\n"
-
-            "Logical Framework:\n"
-            "• Deductive Reasoning: Premise-based logical conclusions\n"
-            "• Inductive Reasoning: Pattern recognition and generalization\n"
-            "• Abductive Reasoning: Best explanation inference\n"
-            "• Analogical Reasoning: Cross-domain knowledge transfer\n\n"
-
-            "Decision Making:\n"
-            "• Multi-criteria Analysis: Weighted decision matrices\n"
-            "• Scenario Planning: Best, worst, and most likely outcomes\n"
-            "• Game Theory: Strategic interaction analysis\n"
-            "• Cognitive Bias Mitigation: Structured decision processes\n\n"
-
-            "Solution Design:\n"
-            "• Design Thinking: Human-centered problem solving\n"
-            "• First Principles: Fundamental assumption challenging\n"
-            "• TRIZ Methodology: Systematic innovation principles\n"
-            "• Agile Problem Solving: Iterative solution development"
-        )
+        return _REASONING_HEADER.format(lvl=analysis.complexity_level) + _REASONING_BODY
 
     def generate_creative_response(self, query: str, analysis: AnalysisResult) -> str:
         """Creative and innovative thinking approaches"""
 
-        creative_elements = [
-            "Design Thinking methodology with user-centered innovation",
-            "Cross-pollination of ideas from different industries",
-            "Biomimicry principles for nature-inspired solutions",
-            "Lateral thinking techniques for breakthrough insights",
-            "Human-centered design with accessibility as core principle"
-        ]
+        selected_element = _CREATIVE_ELEMENTS[random.randrange(_N_CREATIVE)]
 
-        selected_element = random.choice(creative_elements)
-
-        return (
-            f"🎨 Creative Innovation Framework (Complexity: {analysis.complexity_level})\n\n"
-            f"Primary Approach: {selected_element}\n\n"
-            "Innovation Methodology:\n"
-            "• Divergent Thinking: Generate multiple solution alternatives\n"
-            "• Convergent Analysis: Evaluate and refine promising concepts\n"
-            "• Rapid Prototyping: Quick iteration with user feedback\n"
-            "• Cross-functional Collaboration: Diverse perspective integration\n\n"
-
-            "Creative Techniques:\n"
-            "• SCAMPER Method: Substitute, Combine, Adapt, Modify, Put to other uses, Eliminate, Reverse\n"
-            "• Mind Mapping: Visual association and idea exploration\n"
-            "• Brainstorming 2.0: Structured ideation with building blocks\n"
-            "• Role Playing: Alternative perspective generation\n\n"
-
-            "Implementation Strategy:\n"
-            "• MVP Development: Minimum viable product validation\n"
-            "• A/B Testing: Data-driven feature optimization\n"
-            "• User Journey Mapping: End-to-end experience design\n"
-            "• Feedback Loops: Continuous improvement mechanisms\n\n"
-
-            "Innovation Metrics:\n"
-            "• Time to Market: Development velocity optimization\n"
-            "• User Adoption: Engagement and retention metrics\n"
-            "• Innovation Pipeline: Idea generation and conversion rates\n"
-            "• ROI Measurement: Value creation and cost-benefit analysis"
-        )
+        return (_CREATIVE_HEADER.format(lvl=analysis.complexity_level, element=selected_element)
+                + _CREATIVE_BODY)
 
     def generate_general_response(self, query: str, analysis: AnalysisResult) -> str:
         """Enhanced general-purpose responses with contextual intelligence"""
 
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        return (
-            f"🤖 Advanced AI Analysis (Complexity: {analysis.complexity_level})\n\n"
-            f"Query Understanding:\n"
-            f"• Analysis Confidence: {analysis.confidence:.1%}\n"
-            f"• Reasoning: {analysis.reasoning}\n"
-            f"• Processing Time: {timestamp}\n\n"
-
-            "Multi-Dimensional Response:\n"
-            "• Context Analysis: Understanding implicit requirements and constraints\n"
-            "• Solution Architecture: Comprehensive approach with implementation details\n"
-            "• Risk Assessment: Potential challenges and mitigation strategies\n"
-            "• Success Metrics: Measurable outcomes and validation criteria\n\n"
-
-            "Advanced Capabilities:\n"
-            "• Cross-domain Knowledge: Integration of multiple expertise areas\n"
-            "• Adaptive Learning: Continuous improvement based on feedback\n"
-            "• Ethical Reasoning: Consideration of moral and social implications\n"
-            "• Future-proofing: Anticipation of evolving requirements and technologies\n\n"
-
-            "Next Steps Recommendation:\n"
-            "• Define specific requirements and success criteria\n"
-            "• Conduct stakeholder analysis and alignment\n"
-            "• Develop prototype or proof of concept\n"
-            "• Establish feedback loops and iteration cycles"
-        )
+        timestamp = _current_timestamp()
+
+        header = _GENERAL_HEADER.format(
+            lvl=analysis.complexity_level, confidence=analysis.confidence,
+            reasoning=analysis.reasoning, timestamp=timestamp)
+        return header + _GENERAL_BODY
 
     def process_query(self, query: str) -> str:
         """Enhanced query processing with sophisticated analysis"""
-        if not query.strip():
+        # Same test as 'not query.strip()' without allocating a stripped copy
+        if not query or query.isspace():
             return "Advanced AI Agent: Please provide a specific query for intelligent analysis."
 
-        # Perform deep query analysis
-        analysis = self.analyze_query(query)
+        cached = self._response_cache.get(query)
+        if cached is not None:
+            return cached
 
-        # Route to specialized response generators
-        response_generators = {
-            QueryType.MATHEMATICAL: self.generate_mathematical_response,
-            QueryType.SECURITY: self.generate_security_response,
-            QueryType.ARCHITECTURAL: self.generate_architectural_response,
-            QueryType.OPTIMIZATION: self.generate_optimization_response,
-            QueryType.COMPLIANCE: self.generate_compliance_response,
-            QueryType.INNOVATION: self.generate_innovation_response,
-            QueryType.STRATEGIC: self.generate_strategic_response,
-            QueryType.REASONING: self.generate_reasoning_response,
-            QueryType.CREATIVE: self.generate_creative_response,
-            # Fallback to architectural
-            QueryType.TECHNICAL: self.generate_architectural_response,
-            QueryType.ETHICAL: self.generate_compliance_response,  # Fallback to compliance
-            # Fallback to architectural
-            QueryType.INTEGRATION: self.generate_architectural_response,
-            QueryType.GENERAL: self.generate_general_response
-        }
+        # Perform deep query analysis; lowercase once for all helpers
+        analysis = self._analysis_cache.get(query)
+        if analysis is None:
+            analysis = self.analyze_query(query, query.lower())
+            _cache_put(self._analysis_cache, query, analysis)
 
-        generator = response_generators.get(
+        # Route to specialized response generators
+        generator = self._dispatch.get(
             analysis.query_type, self.generate_general_response)
-        return generator(query, analysis)
+        response = generator(query, analysis)
+
+        if analysis.query_type not in _UNCACHEABLE_TYPES:
+            _cache_put(self._response_cache, query, response)
+        return response
 
 
-def main():
+def main() -> None:
     """Main entry point for the advanced AI agent"""
     agent = AdvancedAIAgent()
 
-    if len(sys.argv) > 1:
+    if sys.argv[1:] == ["--serve"]:
+        # Long-lived mode: one query per stdin line, one JSON object per
+        # stdout line (responses span several lines). Bytes are decoded
+        # here so a malformed line is replaced rather than ending the loop
+        for raw in sys.stdin.buffer:
+            query = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            try:
+                response = agent.process_query(query)
+            except Exception as exc:
+                response = f"Advanced AI Agent: Error processing query: {exc}"
+            print(json.dumps({"query": query, "response": response}, ensure_ascii=False), flush=True)
+    elif len(sys.argv) > 1:
         query = " ".join(sys.argv[1:])
         response = agent.process_query(query)
         print(f"Agent: {response}")